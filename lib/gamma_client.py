@@ -1,46 +1,137 @@
 """Polymarket Gamma API client for ultra-short crypto markets."""
 
-import json
-from typing import Optional, List
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, List, TypeVar
 import httpx
 
+try:
+    import orjson as _json
+except ImportError:  # orjson is an optional speedup
+    import json as _json
+
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 GAMMA_API_BASE = "https://gamma-api.polymarket.com"
 
+T = TypeVar("T")
+
+# Default crypto event slugs scanned by get_crypto_markets
+CRYPTO_EVENT_SLUGS = ['crypto-5m', 'crypto-15m', 'crypto-hourly']
+
+# Connection pool shared by concurrent requests; idle connections are kept
+# long enough to survive the gap between polling scans
+HTTP_LIMITS = httpx.Limits(
+    max_connections=32,
+    max_keepalive_connections=32,
+    keepalive_expiry=30.0
+)
+
+# Max in-flight requests for multi-slug lookups
+MAX_CONCURRENT_REQUESTS = 16
+
+# Max slugs per batched /markets request (keeps URLs short)
+BATCH_SIZE = 25
+
+# Prices assumed when a market has no outcomePrices (already decoded)
+DEFAULT_PRICES = (0.5, 0.5)
+
 
 class GammaClient:
-    """HTTP client for Polymarket Gamma API."""
+    """HTTP client for Polymarket Gamma API.
+    
+    Use as an async context manager to keep one connection pool open
+    across calls; otherwise each call opens a short-lived client.
+    """
 
     def __init__(self, timeout: float = 15.0):
         self.timeout = timeout
+        self._http: Optional[httpx.AsyncClient] = None
 
-    async def get_market_by_slug(self, slug: str) -> Optional[dict]:
-        """Get market by slug via Gamma API.
+    async def __aenter__(self) -> "GammaClient":
+        self._http = self._new_http()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def _new_http(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(timeout=self.timeout, http2=True, limits=HTTP_LIMITS)
+
+    @asynccontextmanager
+    async def _client(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the shared HTTP client, or a temporary one outside `async with`."""
+        if self._http is not None:
+            yield self._http
+        else:
+            async with self._new_http() as http:
+                yield http
+
+    async def get_crypto_markets(self, slugs: Optional[List[str]] = None) -> List[dict]:
+        """Get active markets for crypto events.
+        
+        Events are fetched concurrently over a single pooled client.
         
         Args:
-            slug: Market slug (e.g., 'btc-updown-15m-1771086600')
+            slugs: Event slugs (default: CRYPTO_EVENT_SLUGS)
         
         Returns:
-            Market dict or None if not found
+            List of parsed market dicts, each tagged with 'event_slug'
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as http:
-            try:
+        if slugs is None:
+            slugs = CRYPTO_EVENT_SLUGS
+        
+        async with self._client() as http:
+            
+            async def _fetch(slug: str) -> List[dict]:
                 resp = await http.get(
-                    f"{GAMMA_API_BASE}/markets",
+                    f"{GAMMA_API_BASE}/events",
                     params={"slug": slug}
                 )
                 
-                if resp.status_code == 200:
-                    markets = resp.json()
-                    
-                    if markets and len(markets) > 0:
-                        return self._parse_market(markets[0])
+                if resp.status_code != 200:
+                    return []
+                
+                markets = []
+                for event in _json.loads(resp.content):
+                    for data in event.get('markets', []):
+                        market = self._parse_crypto_market(data, slug)
+                        if market:
+                            markets.append(market)
                 
-                return None
+                return markets
             
-            except Exception as e:
-                print(f"Error fetching market {slug}: {e}")
-                return None
+            results = await asyncio.gather(
+                *[_fetch(slug) for slug in slugs],
+                return_exceptions=True
+            )
+        
+        markets = []
+        for slug, result in zip(slugs, results):
+            if isinstance(result, Exception):
+                logger.warning("Error fetching event %s: %s", slug, result)
+                continue
+            markets.extend(result)
+        
+        return markets
+
+    async def get_market_by_slug(self, slug: str) -> Optional[dict]:
+        """Get market by slug via Gamma API.
+        
+        Args:
+            slug: Market slug (e.g., 'btc-updown-15m-1771086600')
+        
+        Returns:
+            Market dict or None if not found
+        """
+        async with self._client() as http:
+            return await self._fetch_market(http, slug)
 
     async def get_markets_by_slugs(self, slugs: List[str]) -> List[dict]:
         """Get multiple markets by slug.
@@ -49,30 +140,150 @@ class GammaClient:
             slugs: List of market slugs
         
         Returns:
-            List of parsed market dicts
+            List of parsed market dicts, one per slug found (repeated slugs
+            repeat their market), in the order of slugs
         """
-        markets = []
+        markets = await self.get_markets_map(slugs)
+        return [markets[slug] for slug in slugs if slug in markets]
+
+    async def get_markets_map(self, slugs: List[str]) -> Dict[str, dict]:
+        """Get multiple markets by slug, keyed by slug.
         
-        for slug in slugs:
-            market = await self.get_market_by_slug(slug)
-            if market:
-                markets.append(market)
+        Slugs are requested in batched calls of up to BATCH_SIZE slugs each,
+        run concurrently; repeated slugs are requested once. Any slug missing from the batched responses (e.g.
+        if one was truncated) is fetched on its own, concurrently, capped at
+        MAX_CONCURRENT_REQUESTS in flight.
         
-        return markets
+        Args:
+            slugs: List of market slugs
+        
+        Returns:
+            Dict of slug -> parsed market for every market found, in the
+            order of slugs
+        """
+        if not slugs:
+            return {}
+        
+        slugs = list(dict.fromkeys(slugs))
+        
+        async with self._client() as http:
+            batches = await asyncio.gather(*[
+                self._fetch_markets_batch(http, slugs[i:i + BATCH_SIZE])
+                for i in range(0, len(slugs), BATCH_SIZE)
+            ])
+            
+            found = {}
+            for batch in batches:
+                found.update(batch)
+            
+            missing = [slug for slug in slugs if slug not in found]
+            
+            if missing:
+                sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+                
+                async def _one(slug: str) -> Optional[dict]:
+                    async with sem:
+                        return await self._fetch_market(http, slug)
+                
+                results = await asyncio.gather(*[_one(slug) for slug in missing])
+                found.update(zip(missing, results))
+        
+        return {slug: found[slug] for slug in slugs if found.get(slug)}
+
+    async def _fetch_markets_batch(
+        self,
+        http: httpx.AsyncClient,
+        slugs: List[str]
+    ) -> Dict[str, Optional[dict]]:
+        """Fetch several markets in one request using repeated slug params.
+        
+        Args:
+            http: Open HTTP client
+            slugs: Market slugs
+        
+        Returns:
+            Dict of slug -> parsed market (None if unparseable) for every
+            market the API returned; empty on request failure
+        """
+        try:
+            resp = await http.get(
+                f"{GAMMA_API_BASE}/markets",
+                params=[("slug", slug) for slug in slugs]
+            )
+            
+            if resp.status_code != 200:
+                return {}
+            
+            return {
+                data.get('slug'): self._parse_market(data)
+                for data in _json.loads(resp.content)
+            }
+        
+        except Exception as e:
+            logger.warning("Error fetching markets batch: %s", e)
+            return {}
+
+    async def _fetch_market(self, http: httpx.AsyncClient, slug: str) -> Optional[dict]:
+        """Fetch and parse a single market using an existing client.
+        
+        Args:
+            http: Open HTTP client
+            slug: Market slug
+        
+        Returns:
+            Market dict or None if not found
+        """
+        try:
+            resp = await http.get(
+                f"{GAMMA_API_BASE}/markets",
+                params={"slug": slug}
+            )
+            
+            if resp.status_code == 200:
+                markets = _json.loads(resp.content)
+                
+                if markets and len(markets) > 0:
+                    return self._parse_market(markets[0])
+            
+            return None
+        
+        except Exception as e:
+            logger.warning("Error fetching market %s: %s", slug, e)
+            return None
+
+    def _parse_crypto_market(self, data: dict, event_slug: str) -> Optional[dict]:
+        """Parse a crypto event market, tagging it with its event.
+        
+        Args:
+            data: Market data from API
+            event_slug: Slug of the parent event
+        
+        Returns:
+            Parsed market dict tagged with 'event_slug', or None if inactive
+        """
+        market = self._parse_market(data)
+        if market:
+            market['event_slug'] = event_slug
+        
+        return market
 
-    def _parse_market(self, data: dict) -> dict:
+    def _parse_market(self, data: dict) -> Optional[dict]:
         """Parse market JSON into structured dict.
         
         Args:
             data: Market data from API
         
         Returns:
-            Parsed market dict
+            Parsed market dict, or None if inactive or unparseable
         """
+        # Skip closed/resolved/inactive markets before decoding any fields
+        if data.get('closed') or data.get('resolved') or not data.get('active'):
+            return None
+        
         try:
             # Parse prices
-            prices_str = data.get('outcomePrices', '[0.5, 0.5]')
-            prices = json.loads(prices_str) if isinstance(prices_str, str) else prices_str
+            prices_str = data.get('outcomePrices', DEFAULT_PRICES)
+            prices = _json.loads(prices_str) if isinstance(prices_str, str) else prices_str
             
             yes_price = float(prices[0]) if len(prices) > 0 else 0.5
             no_price = float(prices[1]) if len(prices) > 1 else (1.0 - yes_price)
@@ -82,8 +293,8 @@ class GammaClient:
             edge = total - 1.0
             
             # Parse token IDs
-            token_ids_str = data.get('clobTokenIds', '[]')
-            token_ids = json.loads(token_ids_str) if isinstance(token_ids_str, str) else token_ids_str
+            token_ids_str = data.get('clobTokenIds', ())
+            token_ids = _json.loads(token_ids_str) if isinstance(token_ids_str, str) else token_ids_str
             
             return {
                 'market_id': data.get('id'),
@@ -106,26 +317,46 @@ class GammaClient:
             }
         
         except Exception as e:
-            print(f"Error parsing market: {e}")
+            logger.warning("Error parsing market: %s", e)
             return None
 
 
-# Sync wrappers for convenience
+# Sync wrappers for convenience.
+# They share one event loop running in a daemon thread, with one GammaClient
+# bound to it, so the connection pool survives between calls.
+_sync_lock = threading.Lock()
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_client: Optional[GammaClient] = None
+
+
+def _run_sync(call: Callable[[GammaClient], Awaitable[T]]) -> T:
+    """Run call(client) on the shared background loop and wait for it."""
+    global _sync_loop, _sync_client
+    
+    with _sync_lock:
+        if _sync_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="gamma-client", daemon=True).start()
+            client = GammaClient()
+            asyncio.run_coroutine_threadsafe(client.__aenter__(), loop).result()
+            _sync_loop, _sync_client = loop, client
+    
+    return asyncio.run_coroutine_threadsafe(call(_sync_client), _sync_loop).result()
+
+
 def fetch_market(slug: str) -> Optional[dict]:
     """Synchronous wrapper for get_market_by_slug."""
-    import asyncio
-    client = GammaClient()
-    return asyncio.run(client.get_market_by_slug(slug))
+    return _run_sync(lambda client: client.get_market_by_slug(slug))
 
 
 def fetch_markets(slugs: List[str]) -> List[dict]:
     """Synchronous wrapper for get_markets_by_slugs."""
-    import asyncio
-    client = GammaClient()
-    return asyncio.run(client.get_markets_by_slugs(slugs))
+    return _run_sync(lambda client: client.get_markets_by_slugs(slugs))
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    
     # Test with current active market
     test_slug = "btc-updown-15m-1771086600"
     
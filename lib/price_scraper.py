@@ -1,69 +1,224 @@
 """Web scraper to extract YES/NO prices from Polymarket event pages."""
 
+import asyncio
+import logging
 import httpx
 import re
-import json
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
+try:
+    import orjson as _json
+except ImportError:  # orjson is an optional speedup
+    import json as _json
 
-def scrape_market_prices(url: str, timeout: float = 15.0) -> Optional[Dict]:
-    """Scrape YES/NO prices from Polymarket event page.
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Start of the Next.js page data script tag
+_NEXT_DATA_TAG = b'<script id="__NEXT_DATA__"'
+
+_TITLE_RE = re.compile(rb'<title>([^<]+)</title>')
+
+# Fallback pattern: "outcomePrices":["0.535","0.465"]
+_PRICES_RE = re.compile(rb'"outcomePrices"\s*:\s*\[([^\]]+)\]')
+_FLOAT_RE = re.compile(rb'(\d+\.\d+)')
+
+# Streaming read size, and how far back to rescan so matches can span chunks
+_CHUNK_SIZE = 65536
+_CHUNK_OVERLAP = 1024
+
+
+def _find_outcome_prices(node) -> Optional[List[float]]:
+    """Depth-first search for the first market object with outcomePrices."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            prices = node.get('outcomePrices')
+            if prices is not None:
+                if isinstance(prices, str):
+                    prices = _json.loads(prices)
+                return [float(p) for p in prices]
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return None
+
+
+def _next_data_prices(html: bytes) -> Optional[List[float]]:
+    """Read outcomePrices from the embedded __NEXT_DATA__ JSON blob.
+    
+    Args:
+        html: Raw page bytes
+    
+    Returns:
+        List of outcome prices, or None if the blob is missing or unusable
+    """
+    start = html.find(_NEXT_DATA_TAG)
+    if start < 0:
+        return None
+    
+    s = html.find(b'>', start) + 1
+    e = html.find(b'</script>', s)
+    if e < 0:
+        return None
+    
+    try:
+        data = _json.loads(html[s:e])
+        page_props = data.get('props', {}).get('pageProps', {})
+        return _find_outcome_prices(page_props)
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def _regex_prices(html: bytes) -> Optional[List[float]]:
+    """Extract outcomePrices by pattern match when __NEXT_DATA__ is absent."""
+    price_match = _PRICES_RE.search(html)
+    
+    if not price_match:
+        return None
+    
+    return [float(p) for p in _FLOAT_RE.findall(price_match.group(1))]
+
+
+def _parse_page(url: str, html: bytes) -> Optional[Dict]:
+    """Extract market data from raw event page bytes.
+    
+    Args:
+        url: Page URL (echoed into the result)
+        html: Raw page bytes
+    
+    Returns:
+        Dict with market data, or None if prices were not found
+    """
+    # Extract title from page
+    title_match = _TITLE_RE.search(html)
+    title = title_match.group(1).decode('utf-8', 'replace') if title_match else "Unknown"
+    
+    # Prefer the structured page data; fall back to pattern matching
+    prices = _next_data_prices(html)
+    if prices is None:
+        prices = _regex_prices(html)
+    
+    if not prices or len(prices) < 2:
+        return None
+    
+    yes_price = float(prices[0])
+    no_price = float(prices[1])
+    total = yes_price + no_price
+    edge = total - 1.0
+    
+    return {
+        'url': url,
+        'title': title.split('|')[0].strip() if '|' in title else title,
+        'yes_price': yes_price,
+        'no_price': no_price,
+        'total': total,
+        'edge': edge,
+        'edge_pct': edge * 100,
+        'has_arbitrage': edge > 0.015  # 1.5%+ threshold
+    }
+
+
+async def scrape_market_prices_async(http: httpx.AsyncClient, url: str) -> Optional[Dict]:
+    """Scrape YES/NO prices from an event page using an open client.
+    
+    The body is streamed and the connection released as soon as the
+    prices can be parsed: at the end of the __NEXT_DATA__ script when the
+    page has one (so the structured parse sees the whole blob), otherwise
+    once the outcomePrices field has been received.
     
     Args:
+        http: Open HTTP client (shared across pages)
         url: Full URL to event page
-        timeout: Request timeout in seconds
     
     Returns:
         Dict with market data, or None if failed
     """
     try:
-        response = httpx.get(url, timeout=timeout, follow_redirects=True)
-        
-        if response.status_code != 200:
-            return None
-        
-        html = response.text
-        
-        # Extract title from page
-        title_match = re.search(r'<title>([^<]+)</title>', html)
-        title = title_match.group(1) if title_match else "Unknown"
-        
-        # Look for outcomePrices in JSON data
-        # Pattern: "outcomePrices":["0.535","0.465"]
-        price_match = re.search(r'"outcomePrices"\s*:\s*\[([^\]]+)\]', html)
-        
-        if not price_match:
-            return None
+        html = bytearray()
+        next_data = -1
         
-        # Extract price values
-        price_str = price_match.group(1)
-        prices = re.findall(r'(\d+\.\d+)', price_str)
+        async with http.stream('GET', url) as response:
+            if response.status_code != 200:
+                return None
+            
+            async for chunk in response.aiter_bytes(chunk_size=_CHUNK_SIZE):
+                search_from = max(0, len(html) - _CHUNK_OVERLAP)
+                html += chunk
+                
+                if next_data < 0:
+                    next_data = html.find(_NEXT_DATA_TAG, search_from)
+                
+                # Inside __NEXT_DATA__, read to its closing tag; outside it,
+                # the first outcomePrices match is enough for the regex parse
+                if next_data >= 0:
+                    if html.find(b'</script>', max(next_data, search_from)) >= 0:
+                        break
+                elif _PRICES_RE.search(html, search_from):
+                    break
         
-        if len(prices) < 2:
-            return None
-        
-        yes_price = float(prices[0])
-        no_price = float(prices[1])
-        total = yes_price + no_price
-        edge = total - 1.0
-        
-        return {
-            'url': url,
-            'title': title.split('|')[0].strip() if '|' in title else title,
-            'yes_price': yes_price,
-            'no_price': no_price,
-            'total': total,
-            'edge': edge,
-            'edge_pct': edge * 100,
-            'has_arbitrage': edge > 0.015  # 1.5%+ threshold
-        }
+        return _parse_page(url, html)
     
     except Exception as e:
-        print(f"Error scraping {url}: {e}")
+        logger.warning("Error scraping %s: %s", url, e)
         return None
 
 
+async def scrape_many(
+    urls: List[str],
+    concurrency: int = 32,
+    timeout: float = 15.0
+) -> List[Optional[Dict]]:
+    """Scrape many event pages concurrently over one connection pool.
+    
+    HTTP/2 is enabled so concurrent page fetches are multiplexed as
+    streams over a shared connection instead of opening one per page.
+    
+    Args:
+        urls: Event page URLs
+        concurrency: Max pages fetched at once
+        timeout: Request timeout in seconds
+    
+    Returns:
+        List of market dicts (None for failures), in the same order as urls
+    """
+    sem = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    
+    async with httpx.AsyncClient(
+        timeout=timeout,
+        follow_redirects=True,
+        http2=True,
+        limits=limits
+    ) as http:
+        
+        async def _one(url: str) -> Optional[Dict]:
+            async with sem:
+                return await scrape_market_prices_async(http, url)
+        
+        return await asyncio.gather(*[_one(url) for url in urls])
+
+
+def scrape_market_prices(url: str, timeout: float = 15.0) -> Optional[Dict]:
+    """Scrape YES/NO prices from Polymarket event page.
+    
+    Synchronous one-shot wrapper; use scrape_many for bulk scraping.
+    
+    Args:
+        url: Full URL to event page
+        timeout: Request timeout in seconds
+    
+    Returns:
+        Dict with market data, or None if failed
+    """
+    return asyncio.run(scrape_many([url], concurrency=1, timeout=timeout))[0]
+
+
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    
     # Test with current active market
     test_url = "https://polymarket.com/event/btc-updown-15m-1771086600"
     
@@ -8,19 +8,54 @@ These markets use predictable timestamp-based URLs:
 Timestamp = market close time in Unix epoch seconds (UTC)
 """
 
-from datetime import datetime, timedelta, timezone
+import time
+from datetime import datetime, timezone
 from typing import List, Dict
 
 
+_UTC = timezone.utc
+_FMT = "%Y-%m-%d %H:%M:%S UTC"
+
+
+# Market cycle length in seconds, by interval
+CYCLE_SECONDS = {'5m': 300, '15m': 900, 'hourly': 3600}
+
+MARKET_URL_BASE = "https://polymarket.com/event/"
+
+# Slug prefix by interval; the close timestamp is appended
+_SLUG_PREFIX = {interval: f"btc-updown-{interval}-" for interval in CYCLE_SECONDS}
+
+# get_current_markets results:
+# (intervals, iso_times) -> (valid_from_ts, expires_ts, markets)
+_current_cache: Dict[tuple, tuple] = {}
+
+
+def add_iso_times(market: Dict[str, any]) -> Dict[str, any]:
+    """Add ISO-8601 'open_time' / 'close_time' strings to a market dict.
+    
+    Args:
+        market: Market dict with 'open_ts' and 'close_ts'
+    
+    Returns:
+        The same dict, updated in place
+    """
+    market['open_time'] = datetime.fromtimestamp(market['open_ts'], _UTC).isoformat()
+    market['close_time'] = datetime.fromtimestamp(market['close_ts'], _UTC).isoformat()
+    return market
+
+
 def generate_market_urls(
     intervals: List[str] = None,
-    look_ahead_hours: int = 2
+    look_ahead_hours: int = 2,
+    iso_times: bool = True
 ) -> List[Dict[str, any]]:
     """Generate upcoming market URLs based on timestamp pattern.
     
     Args:
         intervals: List of intervals to generate ('5m', '15m', 'hourly')
         look_ahead_hours: How many hours ahead to generate (default 2)
+        iso_times: Include 'open_time' / 'close_time' ISO strings; callers that
+            only need timestamps and URLs can skip the formatting
     
     Returns:
         List of dicts with market metadata
@@ -29,79 +64,89 @@ def generate_market_urls(
         intervals = ['5m', '15m']
     
     markets = []
-    now = datetime.now(timezone.utc)
+    now_ts = int(time.time())
+    end_ts = now_ts + look_ahead_hours * 3600
     
     for interval in intervals:
-        # Determine cycle duration
-        if interval == '5m':
-            cycle_minutes = 5
-            cycle_seconds = 300
-        elif interval == '15m':
-            cycle_minutes = 15
-            cycle_seconds = 900
-        elif interval == 'hourly':
-            cycle_minutes = 60
-            cycle_seconds = 3600
-        else:
+        cycle_seconds = CYCLE_SECONDS.get(interval)
+        if cycle_seconds is None:
             continue
         
         # Round to next market close time
         # Markets close at round intervals: XX:00, XX:05, XX:10, ... for 5m
-        minutes_to_next = cycle_minutes - (now.minute % cycle_minutes)
-        next_close = now + timedelta(
-            minutes=minutes_to_next,
-            seconds=-now.second,
-            microseconds=-now.microsecond
-        )
-        
-        # Generate markets for next N hours
-        end_time = now + timedelta(hours=look_ahead_hours)
+        next_close_ts = (now_ts // cycle_seconds + 1) * cycle_seconds
+        slug_prefix = _SLUG_PREFIX[interval]
         
-        current_close = next_close
-        while current_close <= end_time:
-            close_timestamp = int(current_close.timestamp())
-            
-            # Calculate open time (close_time - interval)
-            open_time = current_close - timedelta(seconds=cycle_seconds)
-            
+        # Generate markets for next N hours; open time is one cycle before close
+        for ts in range(next_close_ts, end_ts + 1, cycle_seconds):
+            slug = slug_prefix + str(ts)
             markets.append({
                 'interval': interval,
-                'open_time': open_time.isoformat(),
-                'close_time': current_close.isoformat(),
-                'close_timestamp': close_timestamp,
-                'url': f"https://polymarket.com/event/btc-updown-{interval}-{close_timestamp}",
-                'slug': f"btc-updown-{interval}-{close_timestamp}",
-                'minutes_until_close': int((current_close - now).total_seconds() / 60)
+                'close_timestamp': ts,
+                'open_ts': ts - cycle_seconds,
+                'close_ts': ts,
+                'url': MARKET_URL_BASE + slug,
+                'slug': slug,
+                'minutes_until_close': (ts - now_ts) // 60
             })
-            
-            # Next market
-            current_close += timedelta(seconds=cycle_seconds)
+    
+    if iso_times:
+        for market in markets:
+            add_iso_times(market)
     
     return markets
 
 
-def get_current_markets(intervals: List[str] = None) -> List[Dict[str, any]]:
+def get_current_markets(
+    intervals: List[str] = None,
+    iso_times: bool = True
+) -> List[Dict[str, any]]:
     """Get currently active markets (open but not yet closed).
     
+    The active set only changes at a market boundary, so results are cached
+    between the latest open and the earliest close among them (a clock that
+    steps back before that window rebuilds the set). Each call returns
+    fresh copies with 'minutes_until_close' computed for the current time.
+    
     Args:
         intervals: List of intervals ('5m', '15m', 'hourly')
+        iso_times: Include 'open_time' / 'close_time' ISO strings
     
     Returns:
         List of active market dicts
     """
-    all_markets = generate_market_urls(intervals=intervals, look_ahead_hours=1)
-    now = datetime.now(timezone.utc)
+    key = (tuple(intervals) if intervals is not None else None, iso_times)
+    now_ts = int(time.time())
+    
+    cached = _current_cache.get(key)
+    if cached is not None and cached[0] <= now_ts < cached[1]:
+        return _with_minutes_left(cached[2], now_ts)
+    
+    all_markets = generate_market_urls(intervals=intervals, look_ahead_hours=1, iso_times=False)
     
     # Filter for markets that are currently open
-    active = []
-    for market in all_markets:
-        close_time = datetime.fromisoformat(market['close_time'])
-        open_time = datetime.fromisoformat(market['open_time'])
-        
-        if open_time <= now < close_time:
-            active.append(market)
+    active = [m for m in all_markets if m['open_ts'] <= now_ts < m['close_ts']]
     
-    return active
+    if iso_times:
+        for market in active:
+            add_iso_times(market)
+    
+    if active:
+        _current_cache[key] = (
+            max(m['open_ts'] for m in active),
+            min(m['close_ts'] for m in active),
+            active
+        )
+    
+    return _with_minutes_left(active, now_ts)
+
+
+def _with_minutes_left(markets: List[Dict[str, any]], now_ts: int) -> List[Dict[str, any]]:
+    """Copy market dicts with 'minutes_until_close' set relative to now_ts."""
+    return [
+        {**market, 'minutes_until_close': (market['close_ts'] - now_ts) // 60}
+        for market in markets
+    ]
 
 
 def get_next_market(interval: str = '15m') -> Dict[str, any]:
@@ -119,7 +164,7 @@ def get_next_market(interval: str = '15m') -> Dict[str, any]:
 
 if __name__ == "__main__":
     # Test the generator
-    print("Current time:", datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC"))
+    print("Current time:", datetime.now(_UTC).strftime(_FMT))
     print("\n" + "="*70)
     
     print("\n📊 Currently ACTIVE markets:")
@@ -5,10 +5,12 @@ Scans Polymarket 5M/15M/hourly markets for sum-to-one arbitrage opportunities.
 """
 
 import asyncio
+import logging
 import json
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
 
 # Add lib to path
@@ -16,11 +18,17 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 
 from gamma_client import GammaClient
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
 
 async def scan_arbitrage_opportunities(
     min_edge: float = 0.02,
     min_liquidity: float = 5000.0,
-    slugs: list[str] = None
+    slugs: list[str] = None,
+    client: GammaClient = None
 ) -> list[dict]:
     """Scan crypto markets for sum-to-one arbitrage.
     
@@ -31,11 +39,14 @@ async def scan_arbitrage_opportunities(
         min_edge: Minimum edge required (default 2% = 0.02)
         min_liquidity: Minimum market liquidity (default $5,000)
         slugs: Event slugs to scan (default: 5m, 15m, hourly)
+        client: Shared Gamma client (default: a new one for this scan);
+            pass an entered client to reuse its connection pool
     
     Returns:
         List of arbitrage opportunities sorted by edge (best first)
     """
-    client = GammaClient()
+    if client is None:
+        client = GammaClient()
     
     print(f"🔍 Scanning crypto markets...")
     print(f"   Min edge: {min_edge*100:.1f}%")
@@ -46,31 +57,19 @@ async def scan_arbitrage_opportunities(
     markets = await client.get_crypto_markets(slugs)
     print(f"   Fetched {len(markets)} active markets\n")
     
+    # Edge and total are already computed by GammaClient._parse_market.
+    # Markets are freshly parsed for this scan, so annotate them in place.
     opportunities = []
     
     for market in markets:
-        # Skip if insufficient liquidity
-        if market['liquidity'] < min_liquidity:
-            continue
-        
-        yes_price = market['yes_price']
-        no_price = market['no_price']
-        total = yes_price + no_price
-        edge = total - 1.0
-        
-        # Check if edge meets threshold
-        if edge >= min_edge:
-            opportunities.append({
-                **market,
-                'total': total,
-                'edge': edge,
-                'edge_pct': edge * 100,
-                'profit_per_10': edge * 10,  # Profit on $10 lot size
-                'profit_per_100': edge * 100,
-            })
+        edge = market['edge']
+        if edge >= min_edge and market['liquidity'] >= min_liquidity:
+            market['profit_per_10'] = edge * 10  # Profit on $10 lot size
+            market['profit_per_100'] = edge * 100
+            opportunities.append(market)
     
     # Sort by edge (best first)
-    opportunities.sort(key=lambda x: x['edge'], reverse=True)
+    opportunities.sort(key=itemgetter('edge'), reverse=True)
     
     return opportunities
 
@@ -113,11 +112,13 @@ async def main():
     slugs = [s.strip() for s in slugs_str.split(',')]
     
     # Scan for opportunities
-    opps = await scan_arbitrage_opportunities(
-        min_edge=min_edge,
-        min_liquidity=min_liquidity,
-        slugs=slugs
-    )
+    async with GammaClient() as client:
+        opps = await scan_arbitrage_opportunities(
+            min_edge=min_edge,
+            min_liquidity=min_liquidity,
+            slugs=slugs,
+            client=client
+        )
     
     # Print results
     print_opportunities(opps, limit=10)
@@ -127,19 +128,32 @@ async def main():
     output_dir.mkdir(exist_ok=True)
     
     output_file = output_dir / "arbitrage_scan.json"
-    with open(output_file, 'w') as f:
-        json.dump({
-            'timestamp': datetime.utcnow().isoformat(),
-            'config': {
-                'min_edge': min_edge,
-                'min_liquidity': min_liquidity,
-                'slugs': slugs
-            },
-            'opportunities': opps
-        }, f, indent=2)
+    scan = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'config': {
+            'min_edge': min_edge,
+            'min_liquidity': min_liquidity,
+            'slugs': slugs
+        },
+        'opportunities': opps
+    }
+    
+    if orjson is not None:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(scan, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, 'w') as f:
+            json.dump(scan, f, indent=2)
     
     print(f"💾 Saved {len(opps)} opportunities to {output_file}")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    logging.basicConfig(level=logging.WARNING)
+    
+    try:
+        import uvloop  # optional speedup, not available on Windows
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -4,33 +4,87 @@
 Paper trading (DRY_RUN=true):
 - Scans for opportunities
 - Simulates trades
-- Logs to data/paper_trades.json
+- Logs to data/paper_trades.jsonl
 
 Live mode (DRY_RUN=false):
 - Requires polyclaw integration
 - Executes real trades on Polymarket
-- Logs to data/live_trades.json
+- Logs to data/live_trades.jsonl
 """
 
 import asyncio
+import logging
 import json
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterator
 
 # Add lib to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 
 from gamma_client import GammaClient
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
 
-async def simulate_arbitrage_trade(market: dict, lot_size: float) -> dict:
+
+def _dumps_line(record: dict) -> bytes:
+    """Serialize one record as a JSON-lines row."""
+    if orjson is not None:
+        return orjson.dumps(record) + b'\n'
+    return json.dumps(record).encode() + b'\n'
+
+
+def append_trades(log_file: Path, trades: list[dict]) -> None:
+    """Append trades to a JSON-lines log, one record per line.
+    
+    Args:
+        log_file: Path to .jsonl trade log
+        trades: Trade result dicts
+    """
+    with open(log_file, 'ab') as f:
+        for trade in trades:
+            f.write(_dumps_line(trade))
+
+
+def load_trades(log_file: Path) -> Iterator[dict]:
+    """Lazily read trades from a JSON-lines log.
+    
+    Args:
+        log_file: Path to .jsonl trade log
+    
+    Yields:
+        Trade result dicts, oldest first
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    
+    with open(log_file, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO-8601 string (second precision)."""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+async def simulate_arbitrage_trade(
+    market: dict,
+    lot_size: float,
+    timestamp: str = None
+) -> dict:
     """Simulate paper trade for arbitrage opportunity.
     
     Args:
         market: Market data with arbitrage opportunity
         lot_size: Trade size in USD
+        timestamp: ISO trade time (default: now); pass one value to
+            stamp a batch of trades without re-reading the clock
     
     Returns:
         Trade result dict
@@ -52,7 +106,7 @@ async def simulate_arbitrage_trade(market: dict, lot_size: float) -> dict:
     profit_pct = (profit / total_cost) * 100
     
     return {
-        'timestamp': datetime.utcnow().isoformat(),
+        'timestamp': timestamp or _now_iso(),
         'market_id': market['market_id'],
         'question': market['question'],
         'event_slug': market['event_slug'],
@@ -114,10 +168,12 @@ async def main():
     from arbitrage import scan_arbitrage_opportunities
     
     # Scan for opportunities
-    opps = await scan_arbitrage_opportunities(
-        min_edge=min_edge,
-        min_liquidity=min_liquidity
-    )
+    async with GammaClient() as client:
+        opps = await scan_arbitrage_opportunities(
+            min_edge=min_edge,
+            min_liquidity=min_liquidity,
+            client=client
+        )
     
     if not opps:
         print("❌ No tradeable opportunities found")
@@ -127,13 +183,14 @@ async def main():
     
     # Execute best opportunities (up to max_trades)
     trades = []
+    batch_ts = _now_iso()
     for i, opp in enumerate(opps[:max_trades], 1):
         print(f"🎯 Trade #{i}/{max_trades}")
         print(f"   {opp['question'][:60]}...")
         print(f"   Edge: {opp['edge_pct']:.2f}% | Expected profit: ${opp['profit_per_10'] * (lot_size/10):.2f}")
         
         if dry_run:
-            result = await simulate_arbitrage_trade(opp, lot_size)
+            result = await simulate_arbitrage_trade(opp, lot_size, batch_ts)
             print(f"   ✅ SIMULATED: Profit ${result['profit']:.3f} ({result['profit_pct']:.2f}%)")
         else:
             result = await execute_live_trade(opp, lot_size)
@@ -149,19 +206,10 @@ async def main():
     output_dir = Path(__file__).parent.parent / "data"
     output_dir.mkdir(exist_ok=True)
     
-    log_file = output_dir / ('paper_trades.json' if dry_run else 'live_trades.json')
+    log_file = output_dir / ('paper_trades.jsonl' if dry_run else 'live_trades.jsonl')
     
     # Append to log
-    if log_file.exists():
-        with open(log_file, 'r') as f:
-            log = json.load(f)
-    else:
-        log = {'trades': []}
-    
-    log['trades'].extend(trades)
-    
-    with open(log_file, 'w') as f:
-        json.dump(log, f, indent=2)
+    append_trades(log_file, trades)
     
     print(f"💾 Saved {len(trades)} trades to {log_file}")
     
@@ -177,4 +225,11 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    logging.basicConfig(level=logging.WARNING)
+    
+    try:
+        import uvloop  # optional speedup, not available on Windows
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
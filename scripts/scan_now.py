@@ -3,10 +3,22 @@
 
 Combines timestamp-based market discovery with Gamma API price fetching
 to find structure farming opportunities.
+
+Runs a single scan by default. With --watch SECONDS it keeps rescanning
+over the same connection; --events PATH streams arbitrage opportunities as
+JSON lines to a file or named pipe for downstream consumers.
 """
 
+import argparse
 import asyncio
+import functools
+import json
+import logging
+import math
+import os
+import select
 import sys
+import time
 from pathlib import Path
 from datetime import datetime, timezone
 
@@ -16,98 +28,332 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 from timestamp_markets import get_current_markets, generate_market_urls
 from gamma_client import GammaClient
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+_UTC = timezone.utc
+_FMT = '%Y-%m-%d %H:%M:%S UTC'
+
+# How long to wait for a stalled pipe reader once an event line is half written
+EVENT_WRITE_TIMEOUT = 1.0
+
+# O_NONBLOCK is POSIX-only; on Windows a plain blocking open is used
+_O_NONBLOCK = getattr(os, 'O_NONBLOCK', 0)
+
+# Markets whose liquidity was last seen below this are not re-fetched...
+MIN_LIQUIDITY = 1.0
+
+# ...until their reading is this old; new windows often open empty and
+# fill within seconds, so dead readings must not stick for the whole window
+LIQUIDITY_RECHECK_SECONDS = 30.0
 
-async def scan_active_markets(intervals: list[str] = None, min_edge: float = 0.015):
+
+def _is_dead(
+    prev_liquidity: dict[str, tuple[float, float]],
+    slug: str,
+    min_liquidity: float,
+    now: float
+) -> bool:
+    """Whether a market's recent liquidity reading says to skip fetching it."""
+    reading = prev_liquidity.get(slug)
+    if reading is None:
+        return False
+    liquidity, checked_at = reading
+    return liquidity < min_liquidity and now - checked_at < LIQUIDITY_RECHECK_SECONDS
+
+
+async def scan_active_markets(
+    client: GammaClient,
+    intervals: list[str] = None,
+    min_edge: float = 0.015,
+    prev_liquidity: dict[str, tuple[float, float]] = None,
+    min_liquidity: float = MIN_LIQUIDITY
+):
     """Scan currently active markets for arbitrage opportunities.
     
     Args:
+        client: Gamma client, shared across scans to reuse connections
         intervals: Market intervals to scan ('5m', '15m', 'hourly')
         min_edge: Minimum edge threshold (default 1.5%)
+        prev_liquidity: Snapshot of slug -> (liquidity, time.monotonic() of
+            the reading) carried between scans; markets read below
+            min_liquidity within LIQUIDITY_RECHECK_SECONDS are skipped
+            before the API call. Updated in place with this scan's values.
+        min_liquidity: Liquidity below which a market is treated as dead
     
     Returns:
-        List of markets with arbitrage opportunities
+        Tuple of (scanned markets, each with 'has_arbitrage' set for
+        min_edge; number of active markets; number of those skipped for
+        low liquidity)
     """
     if intervals is None:
         intervals = ['5m', '15m']
     
     # Get currently active markets
-    active_markets = get_current_markets(intervals)
+    active_markets = get_current_markets(intervals, iso_times=False)
     
     if not active_markets:
         print("No active markets right now")
-        return []
+        return [], 0, 0
+    
+    active_count = len(active_markets)
+    skipped = 0
+    
+    if prev_liquidity is not None:
+        # Forget markets that are no longer active, then drop dead ones
+        live_slugs = {m['slug'] for m in active_markets}
+        for slug in [s for s in prev_liquidity if s not in live_slugs]:
+            del prev_liquidity[slug]
+        
+        now = time.monotonic()
+        candidates = [
+            m for m in active_markets
+            if not _is_dead(prev_liquidity, m['slug'], min_liquidity, now)
+        ]
+        skipped = active_count - len(candidates)
+        active_markets = candidates
+        
+        if skipped:
+            print(f"   Skipping {skipped} market(s) with no liquidity on a recent scan")
+        
+        if not active_markets:
+            return [], active_count, skipped
     
     print(f"📊 Scanning {len(active_markets)} active market(s)...\n")
     
-    # Fetch prices via API
-    client = GammaClient()
-    slugs = [m['slug'] for m in active_markets]
+    # Fetch prices via API (batched, keyed by slug)
+    data = await client.get_markets_map([m['slug'] for m in active_markets])
+    
+    # Join timestamp metadata (interval, close_ts, ...) with live market
+    # data on slug, scoring against this scan's threshold in the same pass.
+    market_data = [
+        {**active, **market, 'has_arbitrage': market['edge'] > min_edge}
+        for active in active_markets
+        if (market := data.get(active['slug']))
+    ]
     
-    market_data = await client.get_markets_by_slugs(slugs)
+    if prev_liquidity is not None:
+        checked_at = time.monotonic()
+        prev_liquidity.update({m['slug']: (m['liquidity'], checked_at) for m in market_data})
+    
+    return market_data, active_count, skipped
+
+
+@functools.lru_cache(maxsize=1024)
+def format_liquidity(liquidity: float) -> str:
+    """Format liquidity for display, cached since it rarely changes between scans."""
+    return f"${liquidity:,.0f}"
+
+
+def _positive_float(value: str) -> float:
+    """argparse type for a strictly positive number of seconds."""
+    try:
+        seconds = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number: {value!r}")
+    if not (math.isfinite(seconds) and seconds > 0):
+        raise argparse.ArgumentTypeError(f"must be a finite number greater than 0, got {value}")
+    return seconds
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Scan active ultra-short crypto markets for arbitrage.")
+    parser.add_argument(
+        '--verbose', action='store_true',
+        help="Show details for every scanned market, not just arbitrage opportunities"
+    )
+    parser.add_argument(
+        '--watch', type=_positive_float, metavar='SECONDS',
+        help="Keep running, rescanning every SECONDS over the same connection"
+    )
+    parser.add_argument(
+        '--events', type=Path, metavar='PATH',
+        help="Append each arbitrage opportunity as a JSON line to PATH (file or named pipe)"
+    )
+    return parser.parse_args(argv)
+
+
+def emit_events(path: Path, opps: list[dict]) -> None:
+    """Append arbitrage opportunities to a JSON-lines event sink.
     
-    # Filter for arbitrage opportunities
-    opportunities = []
+    The sink is opened non-blocking (where supported) so a named pipe never
+    stalls the scan loop: with no reader attached, or a reader that has
+    fallen behind, the remaining events are dropped with a warning. Each
+    line is written out in full; only a reader that stops reading for
+    EVENT_WRITE_TIMEOUT in the middle of a line can leave it truncated.
     
-    for market in market_data:
-        if market and market['has_arbitrage']:
-            opportunities.append(market)
+    Args:
+        path: Event file or named pipe
+        opps: Arbitrage opportunity dicts
+    """
+    timestamp = datetime.now(_UTC).isoformat(timespec='seconds')
     
-    return market_data, opportunities
+    lines = []
+    for opp in opps:
+        event = {'timestamp': timestamp, **opp}
+        if orjson is not None:
+            lines.append(orjson.dumps(event) + b'\n')
+        else:
+            lines.append(json.dumps(event).encode() + b'\n')
+    
+    written = 0
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | _O_NONBLOCK, 0o644)
+        try:
+            for line in lines:
+                _write_line(fd, line)
+                written += 1
+        finally:
+            os.close(fd)
+    except OSError as e:
+        logger.warning("Dropped %d event(s) for %s: %s", len(lines) - written, path, e)
 
 
-async def main():
-    """Main entry point."""
-    print("🔍 Ultra-Short Market Scanner")
-    print(f"⏰ Current time: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}")
+def _write_line(fd: int, line: bytes) -> None:
+    """Write one whole event line, retrying short writes.
+    
+    Raises BlockingIOError if the sink is full before the line starts (the
+    event is dropped whole) or stays full for EVENT_WRITE_TIMEOUT once part
+    of it has gone out.
+    """
+    view = memoryview(line)
+    while view:
+        try:
+            view = view[os.write(fd, view):]
+        except BlockingIOError:
+            if len(view) == len(line):
+                raise
+            # Finish a started line rather than leave half an event behind
+            if not select.select([], [fd], [], EVENT_WRITE_TIMEOUT)[1]:
+                raise
+
+
+async def run_scan(
+    client: GammaClient,
+    args: argparse.Namespace,
+    prev_liquidity: dict[str, tuple[float, float]]
+) -> None:
+    """Run one scan and print the results.
+    
+    Args:
+        client: Shared Gamma client
+        args: Parsed command-line arguments
+        prev_liquidity: Liquidity snapshot carried between scans
+    """
+    print(f"⏰ Current time: {datetime.now(_UTC).strftime(_FMT)}")
     print("="*70 + "\n")
     
-    # Scan active markets
-    all_markets, arbitrage_opps = await scan_active_markets(['5m', '15m'])
+    # Scan active markets; the upcoming list is built alongside in case
+    # nothing is active (discarded otherwise)
+    (all_markets, active_count, skipped), upcoming = await asyncio.gather(
+        scan_active_markets(client, ['5m', '15m'], prev_liquidity=prev_liquidity),
+        asyncio.to_thread(generate_market_urls, ['5m', '15m'], 1)
+    )
     
     if not all_markets:
+        if active_count:
+            if skipped == active_count:
+                print("⏸  All active markets skipped (no liquidity on a recent scan)")
+            else:
+                print("❌ No market data returned for the active markets")
+            return
+        
         print("❌ No markets currently active")
         print("\nNext markets open soon:")
-        upcoming = generate_market_urls(['5m', '15m'], look_ahead_hours=1)
         for m in upcoming[:3]:
             print(f"  {m['interval'].upper()}: {m['close_time']} (in {m['minutes_until_close']} min)")
         return
     
-    # Display all scanned markets
-    print("Scanned Markets:\n")
+    # Display all scanned markets, buffered into a single write, collecting
+    # arbitrage opportunities in the same pass
+    lines = ["Scanned Markets:\n"]
+    arbitrage_opps = []
+    hidden = 0
     for market in all_markets:
-        interval = market['slug'].split('-')[2]  # Extract interval from slug
-        time_remaining = "?" 
+        # Full detail only when asked for, or when there is something to act on
+        if market['has_arbitrage']:
+            arbitrage_opps.append(market)
+        elif not args.verbose:
+            hidden += 1
+            continue
         
-        print(f"{interval.upper()} | {market['question'][:60]}...")
-        print(f"      YES: ${market['yes_price']:.4f} | NO: ${market['no_price']:.4f} | Total: ${market['total']:.4f}")
+        lines.append(f"{market['interval'].upper()} | {market['question'][:60]}...")
+        lines.append(f"      YES: ${market['yes_price']:.4f} | NO: ${market['no_price']:.4f} | Total: ${market['total']:.4f}")
         
         if market['has_arbitrage']:
-            print(f"      💰 ARBITRAGE: {market['edge_pct']:.2f}% edge | Profit/lot: ${market['edge']*10:.3f} ($10 lot)")
+            lines.append(f"      💰 ARBITRAGE: {market['edge_pct']:.2f}% edge | Profit/lot: ${market['edge']*10:.3f} ($10 lot)")
         else:
-            print(f"      Edge: {market['edge_pct']:.2f}%")
+            lines.append(f"      Edge: {market['edge_pct']:.2f}%")
         
-        print(f"      Liquidity: ${market['liquidity']:,.0f} | Active: {market['active']}")
-        print(f"      {market['url']}")
-        print()
+        lines.append(f"      Liquidity: {format_liquidity(market['liquidity'])} | Active: {market['active']}")
+        lines.append(f"      {market['url']}")
+        lines.append("")
+    
+    if hidden:
+        lines.append(f"({hidden} market(s) without arbitrage hidden; use --verbose to show)\n")
+    
+    if arbitrage_opps and args.events:
+        emit_events(args.events, arbitrage_opps)
     
     # Summary
-    print("="*70)
+    lines.append("="*70)
     if arbitrage_opps:
-        print(f"\n🎯 FOUND {len(arbitrage_opps)} ARBITRAGE OPPORTUNITY(IES)!")
+        lines.append(f"\n🎯 FOUND {len(arbitrage_opps)} ARBITRAGE OPPORTUNITY(IES)!")
         
         for opp in arbitrage_opps:
-            print(f"\n  Market: {opp['question']}")
-            print(f"  Edge: {opp['edge_pct']:.2f}%")
-            print(f"  Strategy: Buy both YES (${opp['yes_price']:.4f}) + NO (${opp['no_price']:.4f})")
-            print(f"  Guaranteed profit: ${opp['edge']*10:.3f} per $10 lot")
-            print(f"  URL: {opp['url']}")
+            lines.append(f"\n  Market: {opp['question']}")
+            lines.append(f"  Edge: {opp['edge_pct']:.2f}%")
+            lines.append(f"  Strategy: Buy both YES (${opp['yes_price']:.4f}) + NO (${opp['no_price']:.4f})")
+            lines.append(f"  Guaranteed profit: ${opp['edge']*10:.3f} per $10 lot")
+            lines.append(f"  URL: {opp['url']}")
     else:
-        print("\n✓ All markets efficiently priced (no arbitrage > 1.5%)")
-        print("\nKeep scanning - opportunities appear during:")
-        print("  - Thin liquidity periods")
-        print("  - Rapid BTC price movements")
-        print("  - Market open/close transitions")
+        lines.append("\n✓ All markets efficiently priced (no arbitrage > 1.5%)")
+        lines.append("\nKeep scanning - opportunities appear during:")
+        lines.append("  - Thin liquidity periods")
+        lines.append("  - Rapid BTC price movements")
+        lines.append("  - Market open/close transitions")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+async def main():
+    """Main entry point."""
+    args = parse_args()
+    
+    print("🔍 Ultra-Short Market Scanner")
+    
+    # One client for the whole run, so watch mode keeps its connection warm
+    prev_liquidity: dict[str, tuple[float, float]] = {}
+    
+    async with GammaClient() as client:
+        while True:
+            await run_scan(client, args, prev_liquidity)
+            
+            if not args.watch:
+                break
+            
+            print()
+            await asyncio.sleep(args.watch)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    logging.basicConfig(level=logging.WARNING)
+    
+    try:
+        import uvloop  # optional speedup, not available on Windows
+    except ImportError:
+        uvloop = None
+    
+    try:
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
+    except KeyboardInterrupt:
+        pass